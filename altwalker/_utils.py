@@ -15,10 +15,12 @@
 
 """Utility functions and classes used by AltWalker internally."""
 
+import functools
 import importlib.resources
 import platform
 import subprocess
 import sys
+import threading
 
 import psutil
 
@@ -84,6 +86,41 @@ def execute_command(command, timeout=None):
     return output, error
 
 
+def stream_command(command):
+    """Execute a command using ``subprocess.Popen`` and yield the lines of the output as they are written.
+
+    The ``stderr`` data is collected from a background thread, so the process can't block on a full pipe.
+
+    Returns:
+        bytes: The ``stderr`` data, as the return value of the generator.
+    """
+
+    command = prefix_command(command)
+
+    process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    error = []
+
+    error_thread = threading.Thread(target=lambda: error.append(process.stderr.read()), daemon=True)
+    error_thread.start()
+    completed = False
+
+    try:
+        with process.stdout:
+            yield from process.stdout
+
+        completed = True
+    finally:
+        if not completed and process.poll() is None:
+            # The consumer stopped early, so nobody is reading the output anymore.
+            process.kill()
+
+        process.wait()
+        error_thread.join()
+        process.stderr.close()
+
+    return error[0] if error else b""
+
+
 def has_command(command, timeout=None):
     """Returns True if it can run the command, otherwise returns False."""
 
@@ -94,8 +131,12 @@ def has_command(command, timeout=None):
         return False
 
 
+@functools.lru_cache(maxsize=1)
 def has_git(timeout=None):
-    """Returns True if it can run ``git --version``, otherwise returns False."""
+    """Returns True if it can run ``git --version``, otherwise returns False.
+
+    The result is cached, so ``git`` is only executed once per process.
+    """
 
     return has_command(["git", "--version"], timeout=timeout)
 
@@ -115,18 +156,25 @@ class Factory:
 
 
 class Command:
-    """Run a command in a new process using ``psutil.Popen``."""
+    """Run a command in a new process using ``psutil.Popen``.
+
+    The output of the process (``stdout`` and ``stderr``) is read through a pipe and written
+    to ``output_file``. The output must be consumed, either with :func:`read_output` or
+    with :func:`forward_output`, otherwise the process will block once the pipe is full.
+    """
 
     def __init__(self, command, output_file):
         self.command = prefix_command(command)
         self.output_file = output_file
-        self.file_handler = open(self.output_file, "w")
+        self.file_handler = open(self.output_file, "wb")
+        self.process = None
+        self._output_thread = None
 
         try:
             self.process = psutil.Popen(
                 command,
-                stdout=self.file_handler,
-                stderr=self.file_handler,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 start_new_session=True,
                 shell=platform.system() == "Windows"
             )
@@ -138,8 +186,51 @@ class Command:
     def pid(self):
         return self.process.pid
 
+    def read_output(self):
+        """Yield the lines written by the process as soon as they are available.
+
+        Each line is also written to the output file. The iteration stops when the process
+        closes its output (e.g. when it exits).
+        """
+
+        file_handler = self.file_handler
+
+        for line in self.process.stdout:
+            file_handler.write(line)
+            file_handler.flush()
+
+            yield line
+
+    def forward_output(self):
+        """Write the rest of the output of the process to the output file from a background thread."""
+
+        self._output_thread = threading.Thread(target=self._forward_output, daemon=True)
+        self._output_thread.start()
+
+    def _forward_output(self):
+        file_handler = self.file_handler
+
+        with self.process.stdout:
+            try:
+                # No need to flush each line here, the file is flushed when it's closed.
+                for line in self.process.stdout:
+                    file_handler.write(line)
+            except ValueError:
+                # The output file was closed by ``clear`` while the process was still running.
+                pass
+
     def clear(self):
-        """Clear the allocated resources."""
+        """Clear the allocated resources.
+
+        If the output is forwarded and the process is still running, the output written by the
+        process after this call is lost. Use :func:`kill` to stop the process and keep its entire output.
+        """
+
+        if self._output_thread:
+            # The thread closes the pipe once the process exits.
+            self._output_thread.join(timeout=None if self.process.poll() is not None else 1)
+        elif self.process and self.process.stdout:
+            self.process.stdout.close()
 
         if self.file_handler:
             self.file_handler.close()
@@ -18,7 +18,6 @@ import copy
 import io
 import logging
 import os
-import time
 import traceback
 from contextlib import redirect_stdout
 from inspect import signature
@@ -487,19 +486,13 @@ class DotnetExecutorService:
     def _read_logs(self):
         """Read logs to check if the service started correctly."""
 
-        with open(self.output_file) as fp:
-            while 1:
-                where = fp.tell()
-                line = fp.readline()
-                if not line:
-                    time.sleep(0.1)
-                    fp.seek(where)
-                else:
-                    if "Now listening on:" in line:
-                        break
-
-                if self._process.poll() is not None:
-                    self._raise_error()
+        for line in self._process.read_output():
+            if b"Now listening on:" in line:
+                self._process.forward_output()
+                return
+
+        self._process.wait()
+        self._raise_error()
 
     def _raise_error(self):
         logger.error(f"Could not start Dotnet Executor service from {self.path} on {self.server_url}")
@@ -16,30 +16,40 @@
 """A collection of util classes and functions for generating code form model(s)."""
 
 import abc
+import functools
 import logging
 import os
+import pathlib
 import re
 import shutil
 import warnings
 
-from jinja2 import Environment
-
 from altwalker.__version__ import VERSION
 from altwalker._utils import Factory, get_resource, has_git
 from altwalker.code import get_methods
 
 logger = logging.getLogger(__name__)
 
+_NAMESPACE_SEPARATORS = str.maketrans("- ", "..")
+_NAMESPACE_DOTS_RE = re.compile(r'\.+')
+
 
 def _normalize_namespace(string):
     """Normalize string for a namespace."""
 
-    namespace = re.sub(r'[\-\ ]', ".", string)
-    namespace = re.sub(r'\.+', ".", namespace)
+    namespace = string.translate(_NAMESPACE_SEPARATORS)
+    namespace = _NAMESPACE_DOTS_RE.sub(".", namespace)
 
     return namespace.title()
 
 
+def _write_file(path, content):
+    """Write a generated file as UTF-8, keeping ``\\n`` line endings on every platform."""
+
+    with open(path, "w", encoding="utf-8", newline="") as fp:
+        fp.write(content)
+
+
 def _git_init(path):
     """Create a local repository and commit all files."""
 
@@ -53,14 +63,47 @@ def _git_init(path):
         warnings.warn("Git is not installed.")
 
 
-def _render_jinja_template(template, data=None, trim_blocks=True, keep_trailing_newline=False):
+@functools.lru_cache(maxsize=2)
+def _get_jinja_env(trim_blocks=True):
+    """Return the Jinja environment shared by all generators.
+
+    The environment (and ``jinja2`` itself) is only loaded the first time a template
+    is rendered, so commands that never generate code don't pay the import cost.
+    """
+
+    from jinja2 import Environment
+
+    return Environment(trim_blocks=trim_blocks)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_jinja_template(template, trim_blocks=True):
+    """Compile the source of a template, the result is cached so each source is only compiled once."""
+
+    return _get_jinja_env(trim_blocks=trim_blocks).from_string(template)
+
+
+def _render_jinja_template(template, data=None, trim_blocks=True):
+    """Render the source of a template."""
+
     if not data:
         data = dict()
 
-    env = Environment(trim_blocks=trim_blocks, keep_trailing_newline=keep_trailing_newline)
-    template = env.from_string(template)
+    return _compile_jinja_template(template, trim_blocks=trim_blocks).render(**data)
 
-    return template.render(**data)
+
+class _LazyResource:
+    """A class attribute that holds the content of a package resource, read on first access."""
+
+    def __init__(self, path):
+        self.path = path
+        self._content = None
+
+    def __get__(self, instance, owner=None):
+        if self._content is None:
+            self._content = get_resource(self.path)
+
+        return self._content
 
 
 class Generator(metaclass=abc.ABCMeta):
@@ -73,14 +116,16 @@ class Generator(metaclass=abc.ABCMeta):
 
     """
 
-    BASE_GITIGNORE = get_resource("data/templates/generate/gitignore/base.txt")
-    DEFAULT_MODEL = get_resource("data/models/default.json")
+    BASE_GITIGNORE = _LazyResource("data/templates/generate/gitignore/base.txt")
+    DEFAULT_MODEL = _LazyResource("data/models/default.json")
 
     def __init__(self, output_path, model_paths=None, git=False):
         self.output_path = output_path
         self.model_paths = model_paths or []
         self.git = git
 
+        self._models_path = os.path.join(output_path, "models")
+
     def __repr__(self):
         return f"{self.__class__.__name__}({self.output_path!r}, {self.model_paths!r}, {self.git!r})"
 
@@ -93,18 +138,19 @@ class Generator(metaclass=abc.ABCMeta):
         return self.BASE_GITIGNORE
 
     def copy_default_model(self):
-        self.model_paths = [os.path.join(self.output_path, "models", "default.json")]
-        os.makedirs(os.path.join(self.output_path, "models"))
+        model_path = os.path.join(self._models_path, "default.json")
+
+        self.model_paths = [model_path]
+        os.makedirs(self._models_path)
 
-        with open(os.path.join(self.output_path, "models/default.json"), "w") as fp:
-            fp.write(self.DEFAULT_MODEL)
+        _write_file(model_path, self.DEFAULT_MODEL)
 
     def copy_models(self):
-        os.makedirs(os.path.join(self.output_path, "models"))
+        os.makedirs(self._models_path)
 
         for model_path in self.model_paths:
             file_name = os.path.basename(model_path)
-            shutil.copyfile(model_path, os.path.join(self.output_path, "models", file_name))
+            shutil.copyfile(model_path, os.path.join(self._models_path, file_name))
 
     def git_init(self):
         self.generate_gitignore()
@@ -117,18 +163,20 @@ class Generator(metaclass=abc.ABCMeta):
             self.copy_default_model()
 
     def generate_gitignore(self):
-        with open(os.path.join(self.output_path, ".gitignore"), "w") as fp:
-            fp.write(self.gitignore)
+        _write_file(os.path.join(self.output_path, ".gitignore"), self.gitignore)
 
-    @abc.abstractclassmethod
+    @classmethod
+    @abc.abstractmethod
     def generate_methods(cls, *args, **kwargs):
         pass
 
-    @abc.abstractclassmethod
+    @classmethod
+    @abc.abstractmethod
     def generate_class(cls, *args, **kwargs):
         pass
 
-    @abc.abstractclassmethod
+    @classmethod
+    @abc.abstractmethod
     def generate_code(cls, *args, **kwargs):
         pass
 
@@ -179,10 +227,10 @@ class EmptyGenerator(Generator):
 class PythonGenerator(Generator):
     """A class for generating an AltWalker project for python."""
 
-    METHODS_TEMPLATE = get_resource("data/templates/generate/python/methods.jinja")
-    CLASS_TEMPLATE = get_resource("data/templates/generate/python/class.jinja")
-    CODE_TEMPLATE = get_resource("data/templates/generate/python/code.jinja")
-    PYTHON_GITIGNORE = get_resource("data/templates/generate/gitignore/python.txt")
+    METHODS_TEMPLATE = _LazyResource("data/templates/generate/python/methods.jinja")
+    CLASS_TEMPLATE = _LazyResource("data/templates/generate/python/class.jinja")
+    CODE_TEMPLATE = _LazyResource("data/templates/generate/python/code.jinja")
+    PYTHON_GITIGNORE = _LazyResource("data/templates/generate/gitignore/python.txt")
 
     REQUIREMENTS = [
         "altwalker"
@@ -204,21 +252,18 @@ class PythonGenerator(Generator):
     def generate_class(cls, class_name, methods):
         return _render_jinja_template(
             cls.CLASS_TEMPLATE,
-            data={"class_name": class_name, "methods": methods},
-            trim_blocks=True
+            data={"class_name": class_name, "methods": methods}
         )
 
     @classmethod
     def generate_code(cls, classes):
         return _render_jinja_template(
             cls.CODE_TEMPLATE,
-            data={"classes": classes.items()},
-            trim_blocks=True
+            data={"classes": classes.items()}
         )
 
     def generate_requirements(self):
-        with open(os.path.join(self.output_path, "requirements.txt"), "w") as fp:
-            fp.write("\n".join(self.REQUIREMENTS))
+        _write_file(os.path.join(self.output_path, "requirements.txt"), "\n".join(self.REQUIREMENTS))
 
     def generate_tests(self, classes, package_name="tests"):
         self.generate_requirements()
@@ -226,23 +271,22 @@ class PythonGenerator(Generator):
         base_path = os.path.join(self.output_path, package_name)
         os.makedirs(base_path)
 
-        open(os.path.join(base_path, "__init__.py"), "w").close()
+        pathlib.Path(base_path, "__init__.py").touch()
 
-        with open(os.path.join(base_path, "test.py"), "w") as fp:
-            fp.write(self.generate_code(classes))
+        _write_file(os.path.join(base_path, "test.py"), self.generate_code(classes))
 
 
 class DotnetGenerator(Generator):
     """A class for generating an AltWalker project for dotnet."""
 
     VERSION_WILDCARD = "0.3.*"
-    CSPROJ_TEMPLATE = get_resource("data/templates/generate/dotnet/csproj.jinja")
+    CSPROJ_TEMPLATE = _LazyResource("data/templates/generate/dotnet/csproj.jinja")
 
-    METHODS_TEMPLATE = get_resource("data/templates/generate/dotnet/methods.jinja")
-    CLASS_TEMPLATE = get_resource("data/templates/generate/dotnet/class.jinja")
-    CODE_TEMPLATE = get_resource("data/templates/generate/dotnet/code.jinja")
+    METHODS_TEMPLATE = _LazyResource("data/templates/generate/dotnet/methods.jinja")
+    CLASS_TEMPLATE = _LazyResource("data/templates/generate/dotnet/class.jinja")
+    CODE_TEMPLATE = _LazyResource("data/templates/generate/dotnet/code.jinja")
 
-    DOTNET_GITIGNORE = get_resource("data/templates/generate/gitignore/dotnet.txt")
+    DOTNET_GITIGNORE = _LazyResource("data/templates/generate/gitignore/dotnet.txt")
 
     @property
     def gitignore(self):
@@ -252,32 +296,28 @@ class DotnetGenerator(Generator):
     def generate_methods(cls, methods):
         return _render_jinja_template(
             cls.METHODS_TEMPLATE,
-            data={"methods": methods},
-            trim_blocks=True
+            data={"methods": methods}
         )
 
     @classmethod
     def generate_class(cls, class_name, methods):
         return _render_jinja_template(
             cls.CLASS_TEMPLATE,
-            data={"class_name": class_name, "methods": methods},
-            trim_blocks=True
+            data={"class_name": class_name, "methods": methods}
         )
 
     @classmethod
     def generate_csproj(cls):
         return _render_jinja_template(
             cls.CSPROJ_TEMPLATE,
-            data={"version": cls.VERSION_WILDCARD},
-            trim_blocks=True
+            data={"version": cls.VERSION_WILDCARD}
         )
 
     @classmethod
     def generate_code(cls, classes, namespace="Tests"):
         return _render_jinja_template(
             cls.CODE_TEMPLATE,
-            data={"classes": classes.items(), "namespace": namespace},
-            trim_blocks=True
+            data={"classes": classes.items(), "namespace": namespace}
         )
 
     def generate_tests(self, classes, package_name="tests"):
@@ -286,11 +326,8 @@ class DotnetGenerator(Generator):
 
         os.makedirs(base_path)
 
-        with open(os.path.join(base_path, f"{package_name}.csproj"), "w") as fp:
-            fp.write(self.generate_csproj())
-
-        with open(os.path.join(base_path, "Program.cs"), "w") as fp:
-            fp.write(self.generate_code(classes, namespace=namespace))
+        _write_file(os.path.join(base_path, f"{package_name}.csproj"), self.generate_csproj())
+        _write_file(os.path.join(base_path, "Program.cs"), self.generate_code(classes, namespace=namespace))
 
 
 GeneratorFactory = Factory({
@@ -15,19 +15,26 @@
 
 """A collection of function and class that interact with the Graphwalker command and REST service."""
 
+import collections
+import functools
 import json
 import logging
 import os
 import re
-import time
 import urllib.parse
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from altwalker._utils import (Command, execute_command, get_resource_path,
-                              has_command, url_join)
+                              has_command, stream_command, url_join)
 from altwalker.exceptions import GraphWalkerException
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
 LOG_LEVEL_MAP = {
@@ -39,6 +46,15 @@ LOG_LEVEL_MAP = {
     "DEBUG": "DEBUG",
 }
 
+_ERROR_MESSAGE_PREFIX = "An error occurred when running command:"
+_ERROR_MESSAGE_RE = re.compile(re.escape(_ERROR_MESSAGE_PREFIX) + r"[^\r\n]*[\r\n]+([^\r\n]+)")
+
+# The number of lines of the service output kept in memory while waiting for the service to start.
+_STARTUP_OUTPUT_LINES = 1000
+
+# The characters that ``urllib.parse.quote`` never encodes.
+_UNRESERVED_RE = re.compile(r"[A-Za-z0-9_.~-]*")
+
 
 def _get_log_level(level):
     """Map a Python log level to an equivalent GraphWalker log level."""
@@ -49,32 +65,69 @@ def _get_log_level(level):
 def _get_error_message(logs):
     """Get the error message from GraphWalker logs."""
 
-    result = re.search(r"An error occurred when running command:.*[\r\n]+([^\r\n]+)", logs)
+    # Most logs don't contain an error, so look for the literal prefix before running the regex.
+    index = logs.find(_ERROR_MESSAGE_PREFIX)
+    if index == -1:
+        return None
+
+    result = _ERROR_MESSAGE_RE.search(logs, index)
     if result:
         return result.group(1)
 
     return None
 
 
-def _normalize_step(step, verbose=False):
-    """Normalize the step returned by the ``getNext`` request or the offline command."""
+def _quote(string):
+    """Percent-encode a string for use as a part of an URL, skipping ``quote`` if nothing needs encoding."""
 
-    normalized_step = {}
+    if _UNRESERVED_RE.fullmatch(string):
+        return string
+
+    return urllib.parse.quote(string, safe="")
 
-    if verbose:
-        normalized_step["data"] = {k: v for data in step["data"] for k, v in data.items()}
-        normalized_step["properties"] = step.get("properties")
 
-    if step.get("actions"):
-        normalized_step["actions"] = [action.get("Action") for action in step["actions"]]
+def _normalize_step_terse(step):
+    """Normalize the step returned by the ``getNext`` request or the offline command, without the ``data``
+    and ``properties``."""
 
-    normalized_step["id"] = step.get("currentElementID")
-    normalized_step["name"] = step.get("currentElementName")
-    normalized_step["modelName"] = step.get("modelName")
+    normalized_step = {
+        "id": step.get("currentElementID"),
+        "name": step.get("currentElementName"),
+        "modelName": step.get("modelName"),
+    }
+
+    actions = step.get("actions")
+    if actions:
+        normalized_step["actions"] = [action.get("Action") for action in actions]
 
     return normalized_step
 
 
+def _normalize_step_verbose(step):
+    """Normalize a step, including the ``data`` and ``properties``."""
+
+    normalized_step = _normalize_step_terse(step)
+
+    data = {}
+    for item in step["data"]:
+        data.update(item)
+
+    normalized_step["data"] = data
+    normalized_step["properties"] = step.get("properties")
+
+    return normalized_step
+
+
+@functools.lru_cache(maxsize=1)
+def _get_executable():
+    """Return the command used to run GraphWalker: ``gw`` if it is installed, otherwise the bundled jar."""
+
+    if has_command(["gw", "--version"], timeout=1):
+        return ("gw",)
+
+    return ("java", "-jar", get_resource_path("data/graphwalker/graphwalker-cli.jar"))
+
+
 def _create_command(command_name, model_path=None, models=None, port=None, service=None, start_element=None,
                     verbose=False, unvisited=False, blocked=None, debug=None):
     """Create a list containing the executable, command and the list of options for a GraphWalker command.
@@ -95,10 +148,7 @@ def _create_command(command_name, model_path=None, models=None, port=None, servi
         list: A list containing the executable followed command and options.
     """
 
-    if has_command(["gw", "--version"], timeout=1):
-        command = ["gw"]
-    else:
-        command = ["java", "-jar", get_resource_path("data/graphwalker/graphwalker-cli.jar")]
+    command = list(_get_executable())
 
     if debug:
         command.extend(("--debug", _get_log_level(debug)))
@@ -155,11 +205,13 @@ def _execute_command(command, model_path=None, models=None, start_element=None,
     full_command = _create_command(command, model_path=model_path, models=models, start_element=start_element,
                                    verbose=verbose, unvisited=unvisited, blocked=blocked)
 
-    logger.debug(f"Executed command: '{' '.join(full_command)}'.")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Executed command: '%s'.", " ".join(full_command))
+
     output, error = execute_command(full_command)
 
-    logger.debug(f"Output: '{output}'")
-    logger.debug(f"Error: '{error}'")
+    logger.debug("Output: '%s'", output)
+    logger.debug("Error: '%s'", error)
 
     if error:
         error = error.decode("utf-8").strip()
@@ -168,6 +220,40 @@ def _execute_command(command, model_path=None, models=None, start_element=None,
     return output.decode("utf-8")
 
 
+def _stream_command(command, models=None, start_element=None, verbose=False, unvisited=False, blocked=None):
+    """Execute a GraphWalker command and yield the lines of the output as they are written.
+
+    Args:
+        command (:obj:`str`): The name of the GraphWalker command.
+        models (:obj:`list`): A sequence of tuples containing the ``model_path`` and the ``stop_condition``.
+        start_element (:obj:`str`): A starting element for the first model.
+        verbose (:obj:`bool`): Run the command with the verbose flag.
+        unvisited (:obj:`bool`): Run the command with the unvisited flag.
+        blocked (:obj:`bool`): Run the command with the blocked flag.
+
+    Yields:
+        bytes: A line of the output of the command.
+
+    Raises:
+        GraphWalkerException: If GraphWalker return an error.
+    """
+
+    full_command = _create_command(command, models=models, start_element=start_element,
+                                   verbose=verbose, unvisited=unvisited, blocked=blocked)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Executed command: '%s'.", " ".join(full_command))
+
+    error = yield from stream_command(full_command)
+
+    logger.debug("Error: '%s'", error)
+
+    if error:
+        error = error.decode("utf-8").strip()
+        raise GraphWalkerException(error)
+
+
+@functools.lru_cache(maxsize=1)
 def get_version():
     """Retrieves the version of the GraphWalker command by executing the "gw --version" command.
 
@@ -226,22 +312,18 @@ def methods(model_path, blocked=False):
 
     output = _execute_command("methods", model_path=model_path, blocked=blocked)
 
-    if output:
-        return output.strip(os.linesep).split(os.linesep)
+    return output.splitlines()
 
-    return []
 
+def _parse_offline_output(lines, verbose=False):
+    """Parse the lines of the output of the offline command into a list of steps.
 
-def _parse_offline_output(output, verbose=False):
-    """Parse the output of the offline command into a list of steps."""
+    If ``orjson`` is installed it is used to parse the steps, otherwise the standard ``json`` module is used.
+    """
 
-    steps = []
-    for line in output.split(os.linesep):
-        if line:
-            step = json.loads(line)
-            steps.append(_normalize_step(step, verbose=verbose))
+    normalize_step = _normalize_step_verbose if verbose else _normalize_step_terse
 
-    return steps
+    return [normalize_step(_json_loads(line)) for line in lines if line.strip()]
 
 
 def offline(models, start_element=None, verbose=False, unvisited=False, blocked=None):
@@ -263,10 +345,11 @@ def offline(models, start_element=None, verbose=False, unvisited=False, blocked=
     """
 
     # Always call the command with the verbose flag to get the modelName for each step
-    output = _execute_command("offline", models=models, start_element=start_element,
-                              verbose=True, unvisited=unvisited, blocked=blocked)
+    lines = _stream_command("offline", models=models, start_element=start_element,
+                            verbose=True, unvisited=unvisited, blocked=blocked)
 
-    return _parse_offline_output(output, verbose=verbose)
+    # The steps are parsed while GraphWalker is still generating the rest of the path.
+    return _parse_offline_output(lines, verbose=verbose)
 
 
 class GraphWalkerService:
@@ -300,9 +383,11 @@ class GraphWalkerService:
 
         self._process = Command(command, self.output_file)
 
-        logger.debug(f"GraphWalker Service started with command: {' '.join(command)}")
-        logger.debug(f"GraphWalker Service running on port: {self.port}")
-        logger.debug(f"GraphWalker Service running with pid: {self._process.pid}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GraphWalker Service started with command: %s", " ".join(command))
+
+        logger.debug("GraphWalker Service running on port: %s", self.port)
+        logger.debug("GraphWalker Service running with pid: %s", self._process.pid)
 
         # Ignore bare 'except' error because we re-raise the exception.
         try:
@@ -318,30 +403,29 @@ class GraphWalkerService:
         self.kill()
 
     def _read_logs(self):
-        """Read logs to check if the service started correctly."""
+        """Read logs to check if the service started correctly.
 
-        with open(self.output_file) as fp:
-            while 1:
-                where = fp.tell()
-                line = fp.readline()
-                if not line:
-                    time.sleep(0.1)
-                    fp.seek(where)
-                else:
-                    if "[HttpServer] Started" in line:
-                        break
+        The output of the process is read as it is written, so this returns as soon as the service
+        reports that it started, or raises as soon as the process exits.
+
+        The last lines of the output are kept in memory, so the error message can be extracted
+        without reading the log file again.
+        """
 
-                if self._process.poll() is not None:
-                    self._raise_error()
+        output = collections.deque(maxlen=_STARTUP_OUTPUT_LINES)
 
-    def _get_error_message(self):
-        """Read logs to get the error message."""
+        for line in self._process.read_output():
+            if b"[HttpServer] Started" in line:
+                self._process.forward_output()
+                return
 
-        with open(self.output_file) as fp:
-            return _get_error_message(fp.read())
+            output.append(line)
 
-    def _raise_error(self):
-        error = self._get_error_message()
+        self._process.wait()
+        self._raise_error(b"".join(output).decode("utf-8", errors="replace"))
+
+    def _raise_error(self, logs):
+        error = _get_error_message(logs)
 
         logger.error(f"Could not start GraphWalker Service on port: {self.port}")
         logger.error(f"Process exit code: {self._process.poll()}")
@@ -361,7 +445,7 @@ class GraphWalkerService:
     def kill(self):
         """Send the SIGINT signal to the GraphWalker service to kill the process and free the port."""
 
-        logger.debug(f"Killing the GraphWalker Service on port: {self.port}")
+        logger.debug("Killing the GraphWalker Service on port: %s", self.port)
         self._process.kill()
 
 
@@ -386,7 +470,38 @@ class GraphWalkerClient:
         self.verbose = verbose
 
         self.base = f"http://{host}:{port}/graphwalker"
-        logger.debug(f"Initializing a GraphWalkerClient on host: {self.base}")
+
+        # The URLs of the endpoints without parameters are built only once.
+        self._urls = {
+            path: url_join(self.base, path)
+            for path in ("/load", "/hasNext", "/getNext", "/getData", "/restart", "/getStatistics")
+        }
+
+        # Reuse the connection to the service (keep-alive) instead of opening a new one for each request.
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+        logger.debug("Initializing a GraphWalkerClient on host: %s", self.base)
+
+    @property
+    def verbose(self):
+        return self._verbose
+
+    @verbose.setter
+    def verbose(self, verbose):
+        self._verbose = verbose
+        self._normalize_step = _normalize_step_verbose if verbose else _normalize_step_terse
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the connections to the GraphWalker REST service."""
+
+        self._session.close()
 
     def _normalize_fail_message(self, message):
         """Make fail message safe for use a port of an URL."""
@@ -403,21 +518,19 @@ class GraphWalkerClient:
             # convert python boolean value to javascript boolean value
             normalized_value = "true" if value else "false"
         elif isinstance(value, str):
-            normalized_value = f"\"{value}\""
+            # the quotes around a string value are always encoded as %22
+            normalized_value = f"%22{_quote(value)}%22"
         else:
-            normalized_value = str(value)
-
-        normalized_key = urllib.parse.quote(key, safe="")
-        normalized_value = urllib.parse.quote(normalized_value, safe="")
+            normalized_value = _quote(str(value))
 
-        return normalized_key, normalized_value
+        return _quote(key), normalized_value
 
     def _validate_response(self, response):
         if not response.status_code == 200:
             raise GraphWalkerException(f"GraphWalker responded with status code: {response.status_code}.")
 
     def _get_body(self, response):
-        body = response.json()
+        body = _json_loads(response.content)
 
         if body["result"] == "ok":
             body.pop("result")
@@ -433,19 +546,26 @@ class GraphWalkerClient:
         raise GraphWalkerException(
             "GraphWalker did not respond with an ok status.")
 
+    def _get_url(self, path):
+        url = self._urls.get(path)
+
+        # The paths with parameters (e.g. ``/setData/key=value``) are already percent-encoded and start
+        # with a slash, so they can be appended to the base as they are.
+        return url if url else self.base + path
+
     def _get(self, path):
-        response = requests.get(url_join(self.base, path))
+        response = self._session.get(self._get_url(path))
         self._validate_response(response)
         return self._get_body(response)
 
     def _put(self, path):
-        response = requests.put(url_join(self.base, path))
+        response = self._session.put(self._get_url(path))
 
         self._validate_response(response)
         return self._get_body(response)
 
     def _post(self, path, data=None):
-        response = requests.post(url_join(self.base, path), data=data)
+        response = self._session.post(self._get_url(path), data=data)
         self._validate_response(response)
         return self._get_body(response)
 
@@ -458,7 +578,7 @@ class GraphWalkerClient:
             model (:obj:`dict`): The JSON model.
         """
 
-        logger.debug(f"Host {self.base} loads a new model")
+        logger.debug("Host %s loads a new model", self.base)
         self._post("/load", data=json.dumps(model))
 
     def has_next(self):
@@ -505,7 +625,7 @@ class GraphWalkerClient:
         """
 
         step = self._get("/getNext")
-        return _normalize_step(step, verbose=self.verbose)
+        return self._normalize_step(step)
 
     def get_data(self):
         """Returns the graph data.
@@ -529,7 +649,7 @@ class GraphWalkerClient:
             value (:obj:`str`, :obj:`int`, :obj:`bool`): The value to set.
         """
 
-        logger.debug(f"Host {self.base} sets {key} = {value}")
+        logger.debug("Host %s sets %s = %s", self.base, key, value)
 
         normalize_key, normalize_value = self._normalize_data(key, value)
         self._put(f"/setData/{normalize_key}={normalize_value}")
@@ -551,10 +671,10 @@ class GraphWalkerClient:
             message (:obj:`str`): The error message.
         """
 
-        logger.debug(f"Host {self.base} failed with message: {message}")
+        logger.debug("Host %s failed with message: %s", self.base, message)
 
         normalized_message = self._normalize_fail_message(message)
-        response = requests.put(f"{self.base}/fail/{normalized_message}")
+        response = self._session.put(f"{self.base}/fail/{normalized_message}")
         self._validate_response(response)
 
     def get_statistics(self):
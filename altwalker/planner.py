@@ -78,10 +78,13 @@ class OnlinePlanner(Planner):
         self._client = client
 
     def kill(self):
-        """Stop the GraphWalkerService process if needed."""
+        """Close the client connections and stop the GraphWalkerService process if needed."""
 
-        if self._service:
-            self._service.kill()
+        try:
+            self._client.close()
+        finally:
+            if self._service:
+                self._service.kill()
 
     def load(self, models):
         """Load the module(s) and reset the execution and the statistics."""
@@ -0,0 +1,34 @@
+#    Copyright(C) 2023 Altom Consulting
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from altwalker._utils import has_git
+from altwalker.graphwalker import _get_executable, get_version
+
+
+def _clear_caches():
+    has_git.cache_clear()
+    _get_executable.cache_clear()
+    get_version.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Clear the memoized commands, so each test sees its own mocks."""
+
+    _clear_caches()
+    yield
+    _clear_caches()
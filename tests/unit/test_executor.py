@@ -404,3 +404,27 @@ class TestDotnetExecutorService:
 
         command = DotnetExecutorService._create_command("tests/", "http://localhost:5000")
         assert command == ['dotnet', 'run', '-p', 'tests/', '--server.urls=http://localhost:5000']
+
+    @mock.patch("altwalker.executor.Command")
+    def test_started(self, command_mock):
+        process = command_mock.return_value
+        process.read_output.return_value = iter([b"Building...\n", b"Now listening on: http://localhost:5000\n"])
+
+        DotnetExecutorService("tests/")
+
+        process.forward_output.assert_called_once_with()
+        process.kill.assert_not_called()
+
+    @mock.patch("altwalker.executor.Command")
+    def test_process_exits(self, command_mock):
+        process = command_mock.return_value
+        process.read_output.return_value = iter([b"Build FAILED.\n"])
+
+        with pytest.raises(ExecutorException) as excinfo:
+            DotnetExecutorService("tests/", output_file="dotnet.log")
+
+        assert "Check the log file at: dotnet.log" in str(excinfo.value)
+
+        process.forward_output.assert_not_called()
+        process.wait.assert_called_once_with()
+        process.kill.assert_called_once_with()
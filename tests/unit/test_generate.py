@@ -13,15 +13,80 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import json
 import os
+import unittest.mock as mock
 
 import pytest
 
-from altwalker.generate import DotnetGenerator, EmptyGenerator, PythonGenerator
+from altwalker.generate import (DotnetGenerator, EmptyGenerator, Generator,
+                                PythonGenerator, _compile_jinja_template,
+                                _get_jinja_env, _normalize_namespace,
+                                _render_jinja_template)
+
+
+@pytest.mark.parametrize(
+    "string, expected",
+    [
+        ("tests", "Tests"),
+        ("project.tests", "Project.Tests"),
+        ("my-project.tests", "My.Project.Tests"),
+        ("my project.tests", "My.Project.Tests"),
+        ("my - project..tests", "My.Project.Tests"),
+    ]
+)
+def test_normalize_namespace(string, expected):
+    assert _normalize_namespace(string) == expected
 
 
 class TestGenerator:
-    pass
+
+    def test_resources(self):
+        # The class attributes hold the content of the resources, not their paths
+        assert "graphwalker-service.log" in Generator.BASE_GITIGNORE
+        assert "models" in json.loads(Generator.DEFAULT_MODEL)
+
+        assert PythonGenerator.PYTHON_GITIGNORE in PythonGenerator("project").gitignore
+        assert DotnetGenerator.DOTNET_GITIGNORE in DotnetGenerator("project").gitignore
+
+    def test_override_resources(self, tmpdir):
+        class CustomGenerator(EmptyGenerator):
+            BASE_GITIGNORE = "custom.log\n"
+            DEFAULT_MODEL = '{"name": "Custom", "models": []}'
+
+        generator = CustomGenerator(str(tmpdir))
+        generator.generate_gitignore()
+        generator.copy_default_model()
+
+        assert tmpdir.join(".gitignore").read() == "custom.log\n"
+        assert tmpdir.join("models", "default.json").read() == '{"name": "Custom", "models": []}'
+
+    def test_templates(self):
+        # The template attributes hold the source of the templates, not their names
+        assert "{% for method in methods %}" in PythonGenerator.METHODS_TEMPLATE
+        assert "{{ class_name }}" in DotnetGenerator.CLASS_TEMPLATE
+
+    def test_override_templates(self):
+        class CustomGenerator(PythonGenerator):
+            METHODS_TEMPLATE = "{% for method in methods %}{{ method }};{% endfor %}"
+
+        assert CustomGenerator.generate_methods(["vertex_A", "edge_A"]) == "vertex_A;edge_A;"
+
+    def test_override_methods_template(self):
+        # The Python methods template is rendered without ``trim_blocks``
+        class CustomGenerator(PythonGenerator):
+            METHODS_TEMPLATE = "{% for method in methods %}\n{{ method }}{% endfor %}"
+
+        assert CustomGenerator.generate_methods(["vertex_A", "edge_A"]) == "\nvertex_A\nedge_A"
+
+    def test_templates_are_compiled_once(self):
+        _compile_jinja_template.cache_clear()
+
+        with mock.patch("altwalker.generate._get_jinja_env", wraps=_get_jinja_env) as get_env_mock:
+            for _ in range(3):
+                _render_jinja_template("{{ method }} is compiled once", {"method": "vertex_A"})
+
+        get_env_mock.assert_called_once_with(trim_blocks=True)
 
 
 class TestEmptyGenerator:
@@ -19,8 +19,9 @@ import unittest.mock as mock
 import pytest
 
 from altwalker.graphwalker import (GraphWalkerClient, GraphWalkerException,
-                                   _create_command, _execute_command,
-                                   _get_error_message, check, get_version,
+                                   GraphWalkerService, _create_command,
+                                   _execute_command, _get_error_message,
+                                   _stream_command, check, get_version,
                                    methods, offline)
 
 GW_VERSION_OUTPUT = """\
@@ -31,13 +32,24 @@ The software (and it's source) can be downloaded from http://graphwalker.org
 """
 
 
+@pytest.fixture(params=["json", "orjson"])
+def json_loads(request):
+    """Run the test with both the standard ``json`` loader and the optional ``orjson`` loader."""
+
+    module = pytest.importorskip(request.param)
+
+    with mock.patch("altwalker.graphwalker._json_loads", module.loads):
+        yield module.loads
+
+
 class TestGetErrorMessage:
 
     @pytest.mark.parametrize(
         "logs",
         [
             "No error message.",
-            "[HttpServer] Started"
+            "[HttpServer] Started",
+            "An error occurred when running command:"
         ]
     )
     def test_no_error(self, logs):
@@ -55,9 +67,22 @@ class TestGetErrorMessage:
         output = f"An error occurred when running command:\n{error_message}\n"
         assert _get_error_message(output) == error_message
 
+    def test_error_after_logs(self):
+        output = "[main] INFO Starting\r\nAn error occurred when running command: online\r\nAddress already in use.\r\n"
+        assert _get_error_message(output) == "Address already in use."
+
 
 class TestCreateCommand:
 
+    def test_executable_cache(self):
+        has_command_mock = mock.Mock(return_value=True)
+
+        with mock.patch('altwalker.graphwalker.has_command', has_command_mock):
+            _create_command("check")
+            _create_command("offline")
+
+        has_command_mock.assert_called_once_with(["gw", "--version"], timeout=1)
+
     @pytest.mark.parametrize(
         "command",
         [
@@ -199,6 +224,29 @@ class TestExecuteCommand:
         assert output == "output"
 
 
+def _stream(lines, error=b""):
+    yield from lines
+    return error
+
+
+@mock.patch("altwalker.graphwalker.stream_command")
+class TestStreamCommand:
+
+    def test_output(self, stream_command_mock):
+        stream_command_mock.return_value = _stream([b"line 1\n", b"line 2\n"])
+
+        output = list(_stream_command("offline"))
+        assert output == [b"line 1\n", b"line 2\n"]
+
+    def test_error(self, stream_command_mock):
+        stream_command_mock.return_value = _stream([b"line 1\n"], error=b"error message")
+
+        with pytest.raises(GraphWalkerException) as excinfo:
+            list(_stream_command("offline"))
+
+        assert "error message" in str(excinfo.value)
+
+
 @mock.patch("altwalker.graphwalker._execute_command")
 class TestVersion:
 
@@ -227,8 +275,15 @@ class TestVersion:
         assert output == version
         command_mock.assert_called_once_with("--version")
 
+    def test_cache(self, command_mock):
+        command_mock.return_value = GW_VERSION_OUTPUT
+
+        assert get_version() == get_version()
+        command_mock.assert_called_once_with("--version")
+
 
-@mock.patch("altwalker.graphwalker._execute_command")
+@pytest.mark.usefixtures("json_loads")
+@mock.patch("altwalker.graphwalker._stream_command")
 class TestOffline:
 
     def test_execute_command(self, command_mock):
@@ -251,9 +306,9 @@ class TestOffline:
             "modelName": "Example",
             "data": {},
             "properties": []
-        })
+        }).encode()
 
-        command_mock.return_value = output
+        command_mock.return_value = iter([output + b"\n"])
 
         step = {
             "id": "v0",
@@ -271,9 +326,9 @@ class TestOffline:
             "modelName": "Example",
             "data": {},
             "properties": []
-        })
+        }).encode()
 
-        command_mock.return_value = f"{output}\n{output}\n"
+        command_mock.return_value = iter([output + b"\n", b"\n", output + b"\n"])
 
         step = {
             "id": "v0",
@@ -291,9 +346,9 @@ class TestOffline:
             "modelName": "Example",
             "data": {},
             "properties": []
-        })
+        }).encode()
 
-        command_mock.return_value = output
+        command_mock.return_value = iter([output + b"\n"])
 
         step = {
             "id": "v0",
@@ -333,6 +388,7 @@ class TestMethods:
             ("step_A\n", ["step_A"]),
             ("step_A\nstep_B\n", ["step_A", "step_B"]),
             ("step_A\nstep_B\nstep_C\n", ["step_A", "step_B", "step_C"]),
+            ("step_A\r\nstep_B\r\n", ["step_A", "step_B"]),
         ]
     )
     def test_methods(self, command_mock, output, expected):
@@ -342,6 +398,48 @@ class TestMethods:
         assert result == expected
 
 
+@mock.patch("altwalker.graphwalker.Command")
+@mock.patch("altwalker.graphwalker._create_command", return_value=["gw", "online"])
+class TestGraphWalkerService:
+
+    def test_started(self, create_command_mock, command_mock):
+        process = command_mock.return_value
+        process.read_output.return_value = iter([b"[main] INFO Starting\n", b"[HttpServer] Started\n"])
+
+        GraphWalkerService(output_file="graphwalker.log")
+
+        process.forward_output.assert_called_once_with()
+        process.kill.assert_not_called()
+
+    def test_process_exits(self, create_command_mock, command_mock):
+        process = command_mock.return_value
+        process.read_output.return_value = iter([
+            b"[main] INFO Starting\n",
+            b"An error occurred when running command: online\n",
+            b"Address already in use.\n",
+        ])
+
+        with pytest.raises(GraphWalkerException) as excinfo:
+            GraphWalkerService(port=9999, output_file="graphwalker.log")
+
+        assert "GraphWalker Service on port: 9999\nAddress already in use." in str(excinfo.value)
+        assert "graphwalker.log" in str(excinfo.value)
+
+        process.forward_output.assert_not_called()
+        process.wait.assert_called_once_with()
+        process.kill.assert_called_once_with()
+
+    def test_process_exits_without_error_message(self, create_command_mock, command_mock):
+        process = command_mock.return_value
+        process.read_output.return_value = iter([b"[main] INFO Starting\n"])
+
+        with pytest.raises(GraphWalkerException) as excinfo:
+            GraphWalkerService(port=9999)
+
+        assert "Could not start the GraphWalker Service on port: 9999" in str(excinfo.value)
+        process.kill.assert_called_once_with()
+
+
 class TestGraphWalkerClient:
 
     @pytest.fixture(autouse=True)
@@ -390,9 +488,10 @@ class TestGraphWalkerClient:
 
         assert "GraphWalker responded with status code: 404." == str(excinfo.value)
 
+    @pytest.mark.usefixtures("json_loads")
     def test_get_body(self):
         body = mock.Mock()
-        body.json.return_value = {"result": "ok", "data": "data"}
+        body.content = json.dumps({"result": "ok", "data": "data"}).encode()
 
         assert self.client._get_body(body) == {"data": "data"}
 
@@ -404,15 +503,50 @@ class TestGraphWalkerClient:
             ({"result": "nok", "error": "error message"}, "GraphWalker responded with the error: error message.")
         ]
     )
+    @pytest.mark.usefixtures("json_loads")
     def test_get_body_error(self, response, error):
         body = mock.Mock()
-        body.json.return_value = response
+        body.content = json.dumps(response).encode()
 
         with pytest.raises(GraphWalkerException) as excinfo:
             self.client._get_body(body)
 
         assert error == str(excinfo.value)
 
+    def test_close(self):
+        self.client._session = mock.Mock()
+
+        with self.client as client:
+            assert client is self.client
+
+        self.client._session.close.assert_called_once_with()
+
+    @pytest.mark.parametrize(
+        "path, url",
+        [
+            ("/getNext", "http://1.2.3.4:9999/graphwalker/getNext"),
+            ("/setData/count=1", "http://1.2.3.4:9999/graphwalker/setData/count=1"),
+        ]
+    )
+    def test_get_url(self, path, url):
+        assert self.client._get_url(path) == url
+
+    def test_session(self):
+        self.client._session = mock.Mock()
+        self.client._session.put.return_value.status_code = 200
+
+        self.client.fail("Error message.")
+        self.client._session.put.assert_called_once_with("http://1.2.3.4:9999/graphwalker/fail/Error%20message.")
+
+    def test_load(self):
+        self.client._post = mock.Mock()
+
+        # Integer keys and integers beyond 64 bits are serialized like the standard json module does
+        model = {"name": "Model", "models": [], 1: 2 ** 70}
+        self.client.load(model)
+
+        self.client._post.assert_called_once_with("/load", data=json.dumps(model))
+
     def test_get_next(self):
         self.client._get = mock.Mock(return_value={
             "currentElementID": "v0",
@@ -66,6 +66,21 @@ class TestOnlinePlanner(unittest.TestCase):
         # Should call the kill method from the service
         self.service.kill.assert_called_once_with()
 
+    def test_kill_closes_client(self):
+        self.planner.kill()
+
+        # Should close the client session
+        self.client.close.assert_called_once_with()
+
+    def test_kill_when_close_fails(self):
+        self.client.close.side_effect = RuntimeError("Error message.")
+
+        with self.assertRaises(RuntimeError):
+            self.planner.kill()
+
+        # Should still call the kill method from the service
+        self.service.kill.assert_called_once_with()
+
     def test_kill_with_no_service(self):
         self.planner._service = None
         self.planner.kill()
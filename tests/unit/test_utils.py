@@ -13,12 +13,16 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program. If not, see <https://www.gnu.org/licenses/>.
 
+import io
 import subprocess
+import sys
+import time
 import unittest.mock as mock
 
 import pytest
 
-from altwalker._utils import has_command, has_git, prefix_command, url_join
+from altwalker._utils import (Command, has_command, has_git, prefix_command,
+                              stream_command, url_join)
 
 
 @pytest.mark.parametrize(
@@ -96,6 +100,89 @@ class TestHasCommand:
         assert not has_command(["git", "--version"])
 
 
+@mock.patch("subprocess.Popen")
+@mock.patch("altwalker._utils.prefix_command", side_effect=lambda command: command)
+class TestStreamCommand:
+
+    @pytest.fixture(autouse=True)
+    def thread_mock(self):
+        self.threads = []
+
+        def create_thread(target, daemon):
+            # A fake thread that runs its target synchronously when started.
+            thread = mock.Mock()
+            thread.start.side_effect = target
+            self.threads.append(thread)
+
+            return thread
+
+        with mock.patch("altwalker._utils.threading.Thread", side_effect=create_thread):
+            yield
+
+    def create_process(self, popen_mock, stdout=b"", stderr=b"", returncode=0):
+        process = mock.Mock()
+        process.stdout = io.BytesIO(stdout)
+        process.stderr = io.BytesIO(stderr)
+        process.poll.return_value = returncode
+        popen_mock.return_value = process
+
+        return process
+
+    def consume(self, generator):
+        lines = []
+
+        try:
+            while True:
+                lines.append(next(generator))
+        except StopIteration as e:
+            return lines, e.value
+
+    def test_output(self, prefix_command_mock, popen_mock):
+        self.create_process(popen_mock, stdout=b"line 1\nline 2\n")
+
+        lines, error = self.consume(stream_command(["gw", "offline"]))
+
+        assert lines == [b"line 1\n", b"line 2\n"]
+        assert error == b""
+
+    def test_error(self, prefix_command_mock, popen_mock):
+        process = self.create_process(popen_mock, stdout=b"line 1\n", stderr=b"error message", returncode=1)
+
+        lines, error = self.consume(stream_command(["gw", "offline"]))
+
+        assert lines == [b"line 1\n"]
+        assert error == b"error message"
+
+        process.kill.assert_not_called()
+        process.wait.assert_called_once_with()
+        assert process.stdout.closed
+        assert process.stderr.closed
+
+    def test_output_closed_before_exit(self, prefix_command_mock, popen_mock):
+        process = self.create_process(popen_mock, stdout=b"line 1\n", returncode=None)
+
+        lines, error = self.consume(stream_command(["gw", "offline"]))
+
+        assert lines == [b"line 1\n"]
+        assert error == b""
+
+        process.kill.assert_not_called()
+        process.wait.assert_called_once_with()
+
+    def test_close_early(self, prefix_command_mock, popen_mock):
+        process = self.create_process(popen_mock, stdout=b"line 1\nline 2\n", returncode=None)
+
+        generator = stream_command(["gw", "offline"])
+        assert next(generator) == b"line 1\n"
+        generator.close()
+
+        process.kill.assert_called_once_with()
+        process.wait.assert_called_once_with()
+        self.threads[0].join.assert_called_once_with()
+        assert process.stdout.closed
+        assert process.stderr.closed
+
+
 @mock.patch("subprocess.Popen")
 @mock.patch("altwalker._utils.prefix_command", side_effect=lambda command: command)
 class TestHasGit:
@@ -121,3 +208,109 @@ class TestHasGit:
     def test_for_timeout(self, prefix_command_mock, popen_mock):
         popen_mock.side_effect = subprocess.TimeoutExpired("git --version", timeout=1)
         assert not has_git()
+
+    def test_cache(self, prefix_command_mock, popen_mock):
+        with mock.patch("altwalker._utils.execute_command", return_value=(b"git version 2.20.1", b"")) as command_mock:
+            assert has_git()
+            assert has_git()
+
+        command_mock.assert_called_once_with(["git", "--version"], timeout=None)
+
+
+class TestCommand:
+
+    MARKER = b"[HttpServer] Started"
+
+    def create_command(self, tmp_path, code):
+        self.output_file = tmp_path / "output.log"
+        return Command([sys.executable, "-c", code], str(self.output_file))
+
+    def read_until_marker(self, command):
+        lines = []
+
+        for line in command.read_output():
+            lines.append(line)
+
+            if self.MARKER in line:
+                return lines
+
+        return lines
+
+    def test_forward_output(self, tmp_path):
+        command = self.create_command(
+            tmp_path,
+            "print('Starting', flush=True)\n"
+            "print('[HttpServer] Started', flush=True)\n"
+            "for i in range(1000):\n"
+            "    print('line', i)\n"
+        )
+
+        lines = self.read_until_marker(command)
+        command.forward_output()
+        command.wait(timeout=5)
+        command.clear()
+
+        assert lines == [b"Starting\n", b"[HttpServer] Started\n"]
+
+        output = self.output_file.read_bytes().splitlines()
+        assert output[:2] == [b"Starting", b"[HttpServer] Started"]
+        assert output[2:] == [f"line {i}".encode() for i in range(1000)]
+
+    def test_process_exits_before_marker(self, tmp_path):
+        command = self.create_command(tmp_path, "print('Address already in use.', flush=True)")
+
+        lines = self.read_until_marker(command)
+        command.wait(timeout=5)
+        command.clear()
+
+        assert lines == [b"Address already in use.\n"]
+        assert self.output_file.read_bytes().splitlines() == [b"Address already in use."]
+
+    def test_kill_while_forwarding(self, tmp_path):
+        command = self.create_command(
+            tmp_path,
+            "print('[HttpServer] Started', flush=True)\n"
+            "while True:\n"
+            "    print('line', flush=True)\n"
+        )
+
+        self.read_until_marker(command)
+        command.forward_output()
+
+        start = time.monotonic()
+        command.kill()
+        command.clear()
+
+        assert time.monotonic() - start < 5
+        assert command.poll() is not None
+        assert not command._output_thread.is_alive()
+
+        output = self.output_file.read_bytes().splitlines()
+        assert output[0] == b"[HttpServer] Started"
+        assert set(output[1:]) <= {b"line"}
+
+    def test_clear_while_forwarding(self, tmp_path):
+        command = self.create_command(
+            tmp_path,
+            "import time\n"
+            "print('[HttpServer] Started', flush=True)\n"
+            "while True:\n"
+            "    print('line', flush=True)\n"
+            "    time.sleep(0.01)\n"
+        )
+
+        self.read_until_marker(command)
+        command.forward_output()
+
+        try:
+            start = time.monotonic()
+            command.clear()
+
+            assert time.monotonic() - start < 5
+            assert command.file_handler is None
+
+            # The thread stops once it can't write to the output file anymore.
+            command._output_thread.join(timeout=5)
+            assert not command._output_thread.is_alive()
+        finally:
+            command.kill()